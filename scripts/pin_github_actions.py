@@ -7,157 +7,521 @@ import os
 import re
 import sys
 import json
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError, URLError
+import http.client
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    # faster decoding of GitHub responses, bulk GraphQL answers in particular
+    import orjson as _json
+except ImportError:
+    _json = json
 
 TOKEN = os.environ.get('GITHUB_TOKEN')
 if not TOKEN:
     print('Set GITHUB_TOKEN in env first', file=sys.stderr)
     sys.exit(1)
 
-WORKFLOW_GLOB = '.github/workflows'
+WORKFLOW_GLOBS = (
+    '.github/workflows/*.yml',
+    '.github/workflows/*.yaml',
+    # composite actions kept in the repo reference other actions too
+    '.github/actions/**/action.yml',
+    '.github/actions/**/action.yaml',
+)
+API_HOST = 'api.github.com'
+API_ROOT = f'https://{API_HOST}'
+# GitHub applies secondary rate limits to bursts of concurrent requests,
+# so keep the resolver fan-out modest.
+MAX_CONCURRENCY = 8
+GRAPHQL_URL = 'https://api.github.com/graphql'
+# aliases per GraphQL query; keeps each query well under GitHub's node limit
+GRAPHQL_CHUNK = 200
+# once fewer requests than this remain in the rate-limit window, wait for the
+# reset instead of running into 403s
+RATE_LIMIT_FLOOR = 100
+# attempts per request when GitHub answers 403/429 with a retryable limit
+MAX_ATTEMPTS = 3
+
+CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'pin_github_actions',
+    'refs.json',
+)
+# branches and moving tags (v4, main) can advance, so their cached SHAs are
+# revalidated after this many seconds; exact semver tags never expire
+CACHE_TTL = 24 * 60 * 60
+SEMVER_RE = re.compile(r'^v?\d+\.\d+\.\d+$')
+
+_cache = {}
+_cache_lock = threading.Lock()
+# one keep-alive connection per worker thread; HTTPSConnection is not thread-safe
+_local = threading.local()
+# latest (remaining, reset epoch) per rate-limit resource ('core', 'graphql')
+_rate_limits = {}
+_rate_lock = threading.Lock()
+
+# match lines like:
+#   - uses: owner/repo@ref
+#   uses: owner/repo@ref
+#   <indent>- uses: owner/repo@ref
+#   uses: "owner/repo/path@ref"
+# anywhere in a whole file; [ \t] rather than \s keeps a match on one line.
+# Only entries that still need pinning match, so the common already-pinned
+# line is rejected inside the regex engine rather than by Python checks.
+USES_RE = re.compile(
+    r'^(?P<indent>[ \t]*)(?P<prefix>-?[ \t]*uses:[ \t]*)(?P<quote>["\']?)'
+    # owner/repo[/path] only: local (./path) and docker:// actions are skipped
+    r'(?P<action>(?!\.|docker://)[^@\s"\'/]+/[^@\s"\']+)@'
+    # refs that already are a full 40-character SHA are skipped
+    r'(?![0-9a-f]{40}(?:[\s"\']|$))(?P<ref>[^\s"\']+)(?P=quote)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class _ConcurrencyLimiter:
+    """Counting semaphore whose limit can be lowered while requests are in flight."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def halve(self):
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
 
 
-def gh_api_get(url):
+_limiter = _ConcurrencyLimiter(MAX_CONCURRENCY)
+
+
+def gh_api_get(url, etag=None):
+    headers = {}
+    if etag:
+        # a 304 answer to a conditional request does not count against the rate limit
+        headers['If-None-Match'] = etag
+    return _gh_send('GET', url, headers=headers)
+
+
+def gh_api_post(url, payload):
+    body = json.dumps(payload).encode('utf-8')
+    return _gh_send('POST', url, body=body, headers={'Content-Type': 'application/json'})
+
+
+def _gh_connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = http.client.HTTPSConnection(API_HOST, timeout=20)
+        _local.conn = conn
+    return conn
+
+
+def _gh_send(method, url, body=None, headers=None):
     # Security: Validate URL to prevent file:// scheme injection
-    if not url.startswith('https://api.github.com/'):
+    if not url.startswith(API_ROOT + '/'):
         raise ValueError(f'Invalid GitHub API URL: {url}')
 
-    req = Request(url)
-    req.add_header('Authorization', f'token {TOKEN}')
-    req.add_header('Accept', 'application/vnd.github.v3+json')
+    path = url[len(API_ROOT):]
+    headers = {
+        'Authorization': f'token {TOKEN}',
+        'Accept': 'application/vnd.github.v3+json',
+        **(headers or {}),
+    }
+    # GraphQL is metered separately from the REST ("core") budget
+    resource = 'graphql' if url == GRAPHQL_URL else 'core'
+    for attempt in range(MAX_ATTEMPTS):
+        _wait_for_rate_limit(resource)
+        with _limiter:
+            result = _gh_exchange(method, path, body, headers)
+        _, status, resp_headers = result
+        if status is None:
+            return result
+        _record_rate_limit(resource, resp_headers)
+        delay = _retry_delay(status, resp_headers, attempt)
+        if delay is None or attempt == MAX_ATTEMPTS - 1:
+            return result
+        # a zero delay means the budget is exhausted; _wait_for_rate_limit
+        # logs and sleeps until the reset at the top of the next attempt
+        if delay:
+            print(f'Warning: {url} returned {status}; retrying in {delay:.0f}s', file=sys.stderr)
+            time.sleep(delay)
+    return result
+
+
+def _gh_exchange(method, path, body, headers):
+    conn = _gh_connection()
+    for attempt in range(2):
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            break
+        except (http.client.HTTPException, OSError) as e:
+            # the server may have dropped an idle keep-alive socket; closing
+            # makes the next request reconnect, and one retry covers that case
+            conn.close()
+            if attempt:
+                print(f'Warning: Request to {API_ROOT}{path} failed: {e}', file=sys.stderr)
+                return str(e), None, {}
+    # bodies stay raw bytes: both orjson and json parse UTF-8 bytes directly
+    return data, resp.status, resp.headers
+
+
+def _record_rate_limit(resource, headers):
     try:
-        with urlopen(req, timeout=20) as resp:
-            return resp.read().decode('utf-8'), resp.getcode()
-    except HTTPError as e:
+        remaining = int(headers['X-RateLimit-Remaining'])
+        reset = float(headers['X-RateLimit-Reset'])
+    except (KeyError, TypeError, ValueError):
+        return
+    with _rate_lock:
+        _rate_limits[resource] = (remaining, reset)
+
+
+def _wait_for_rate_limit(resource):
+    with _rate_lock:
+        remaining, reset = _rate_limits.get(resource, (None, 0.0))
+    if remaining is None or remaining >= RATE_LIMIT_FLOOR:
+        return
+    delay = reset - time.time()
+    if delay > 0:
+        print(f'Rate limit low ({remaining} left); waiting {delay:.0f}s for reset', file=sys.stderr)
+        time.sleep(delay)
+
+
+def _retry_delay(status, headers, attempt):
+    """Return seconds to wait before retrying a rate-limited response, or None."""
+    if status == 429:
+        # too many concurrent requests: back off for the rest of the run
+        _limiter.halve()
+    elif status != 403:
+        return None
+    retry_after = headers.get('Retry-After')
+    if retry_after:
         try:
-            body = e.read().decode('utf-8')
-        except (AttributeError, UnicodeDecodeError) as decode_err:
-            print(f'Warning: Failed to decode HTTP error body: {decode_err}', file=sys.stderr)
-            body = ''
-        return body, e.code
-    except URLError as e:
-        print(f'Warning: URL request failed: {e}', file=sys.stderr)
-        return str(e), None
+            return max(float(retry_after), 2 ** attempt)
+        except ValueError:
+            pass
+    if headers.get('X-RateLimit-Remaining') == '0':
+        # primary limit exhausted; _wait_for_rate_limit sleeps until the reset
+        return 0
+    # a plain 403 is a permission problem, not something a retry fixes
+    return 2 ** attempt if status == 429 else None
 
 
 def resolve_sha(owner, repo, ref):
-    """Try common GitHub API endpoints to resolve a ref to a commit SHA."""
+    """Try common GitHub API endpoints to resolve a ref to a commit SHA.
+
+    Returns (sha, etag); etag is only set when the commits endpoint answered,
+    as that is the response later runs can revalidate cheaply.
+    """
     # try commits endpoint (works for branches, tags, and SHAs)
-    body, code = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/commits/{ref}')
+    body, code, headers = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/commits/{ref}')
     if code == 200:
         try:
-            return json.loads(body).get('sha')
-        except (json.JSONDecodeError, KeyError) as e:
+            return _json.loads(body).get('sha'), headers.get('ETag')
+        except (ValueError, KeyError) as e:
             print(f'Warning: Failed to parse commit response: {e}', file=sys.stderr)
     # try git ref tags (handles lightweight and annotated tags)
-    body, code = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/git/ref/tags/{ref}')
+    body, code, _ = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/git/ref/tags/{ref}')
     if code == 200:
         try:
-            obj = json.loads(body).get('object', {})
+            obj = _json.loads(body).get('object', {})
             obj_sha = obj.get('sha')
-            if obj_sha:
-                # if annotated tag, fetch tag object to resolve to commit
-                body2, code2 = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/git/tags/{obj_sha}')
+            # lightweight tags already point at the commit
+            if obj_sha and obj.get('type') == 'commit':
+                return obj_sha, None
+            if obj_sha and obj.get('type') == 'tag':
+                # annotated tag: fetch the tag object to resolve to commit
+                body2, code2, _ = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/git/tags/{obj_sha}')
                 if code2 == 200:
                     try:
-                        o = json.loads(body2).get('object', {})
-                        return o.get('sha') or obj_sha
-                    except (json.JSONDecodeError, KeyError) as e:
+                        o = _json.loads(body2).get('object', {})
+                        # only a commit target is pinnable; the tag object's
+                        # own SHA (or a tag of a tag) is never returned
+                        if o.get('type') == 'commit' and o.get('sha'):
+                            return o['sha'], None
+                    except (ValueError, AttributeError) as e:
                         print(f'Warning: Failed to parse annotated tag: {e}', file=sys.stderr)
-                        return obj_sha
-                return obj_sha
-        except (json.JSONDecodeError, KeyError) as e:
+                return None, None
+        except (ValueError, KeyError) as e:
             print(f'Warning: Failed to parse git ref tags response: {e}', file=sys.stderr)
-    # try releases by tag name
-    body, code = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/releases/tags/{ref}')
-    if code == 200:
+    # No releases/tags fallback: a release is looked up by the same tag name
+    # the git/ref/tags call above already tried, so it can only succeed when
+    # that call did, and it costs two more round-trips to learn nothing new.
+    return None, None
+
+
+def load_cache():
+    """Load the on-disk ref cache, treating a missing or unreadable file as empty."""
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f'Warning: Ignoring unreadable cache {CACHE_PATH}: {e}', file=sys.stderr)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(cache):
+    """Persist the ref cache atomically so an interrupted run cannot corrupt it."""
+    cache_dir = os.path.dirname(CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.refs.', suffix='.tmp')
+    except OSError as e:
+        print(f'Warning: Failed to write cache {CACHE_PATH}: {e}', file=sys.stderr)
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp, CACHE_PATH)
+    except OSError as e:
+        print(f'Warning: Failed to write cache {CACHE_PATH}: {e}', file=sys.stderr)
         try:
-            tag = json.loads(body).get('tag_name')
-            if tag:
-                body2, code2 = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/git/ref/tags/{tag}')
-                if code2 == 200:
-                    try:
-                        obj_sha = json.loads(body2).get('object', {}).get('sha')
-                        return obj_sha
-                    except (json.JSONDecodeError, KeyError) as e:
-                        print(f'Warning: Failed to parse tag reference: {e}', file=sys.stderr)
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f'Warning: Failed to parse release response: {e}', file=sys.stderr)
-    return None
+            os.unlink(tmp)
+        except OSError:
+            pass
 
 
-def process_file(path):
-    changed = False
-    with open(path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+def _graphql_alias_query(index, owner, repo, ref):
+    # json.dumps yields valid GraphQL string literals, escaping quotes in refs
+    return (
+        f'a{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ '
+        f'object(expression: {json.dumps(ref)}) {{ '
+        '__typename ... on Commit { oid } ... on Tag { target { ... on Commit { oid } } } } }'
+    )
 
-    # match lines like:
-    #   - uses: owner/repo@ref
-    #   uses: owner/repo@ref
-    #   <indent>- uses: owner/repo@ref
-    pattern = re.compile(r'^(?P<indent>\s*)(?P<prefix>-?\s*uses:\s*)(?P<action>[^@\s]+)@(?P<ref>\S+)', re.IGNORECASE)
-    out = []
-    for ln in lines:
-        m = pattern.match(ln)
-        if not m:
-            out.append(ln)
+
+def resolve_shas_bulk(triples):
+    """Resolve many refs with batched GraphQL queries instead of per-ref REST calls.
+
+    Returns {triple: sha} for the refs GraphQL could resolve; anything missing
+    (unknown repo, odd ref, request failure) is left to the REST fallback.
+    """
+    shas = {}
+    for start in range(0, len(triples), GRAPHQL_CHUNK):
+        chunk = triples[start:start + GRAPHQL_CHUNK]
+        aliases = ' '.join(_graphql_alias_query(i, *t) for i, t in enumerate(chunk))
+        body, code, _ = gh_api_post(GRAPHQL_URL, {'query': f'query {{ {aliases} }}'})
+        if code != 200:
+            print(f'Warning: GraphQL request failed with status {code}', file=sys.stderr)
             continue
-        action = m.group('action')
-        ref = m.group('ref')
-        indent = m.group('indent')
-        # prefix = m.group('prefix')  # Not used currently, reserved for future use
-        # local actions like ./ or . should be skipped
-        if action.startswith('.') or action.startswith('./'):
-            out.append(ln)
+        try:
+            # partial errors (e.g. a missing repo) still come back with data
+            payload = _json.loads(body)
+            data = payload.get('data') or {}
+            errors = payload.get('errors') or []
+        except (ValueError, AttributeError) as e:
+            print(f'Warning: Failed to parse GraphQL response: {e}', file=sys.stderr)
             continue
-        # already pinned to full sha
-        if re.fullmatch(r'[0-9a-f]{40}', ref, re.IGNORECASE):
-            out.append(ln)
+        if not data and errors:
+            # the whole query was rejected (complexity, token scope, ...)
+            first = errors[0].get('message') if isinstance(errors[0], dict) else errors[0]
+            print(f'Warning: GraphQL query failed: {first}', file=sys.stderr)
             continue
-        # not a typical owner/repo action (skip)
-        if '/' not in action:
-            out.append(ln)
+        for i, triple in enumerate(chunk):
+            obj = (data.get(f'a{i}') or {}).get('object') or {}
+            if obj.get('__typename') == 'Tag':
+                obj = obj.get('target') or {}
+            if obj.get('oid'):
+                shas[triple] = obj['oid']
+    return shas
+
+
+def cached_sha(owner, repo, ref):
+    """Return the cached SHA for a ref if it is still fresh, else None."""
+    with _cache_lock:
+        entry = _cache.get(f'{owner}/{repo}@{ref}')
+    if entry and entry.get('sha'):
+        if SEMVER_RE.match(ref) or time.time() - entry.get('ts', 0) < CACHE_TTL:
+            return entry['sha']
+    return None
+
+
+def cache_store(owner, repo, ref, sha, etag=None):
+    key = f'{owner}/{repo}@{ref}'
+    with _cache_lock:
+        old = _cache.get(key)
+        # GraphQL answers carry no ETag; when they confirm the cached commit,
+        # keep the earlier REST ETag so the next revalidation can still be a 304
+        if etag is None and old and old.get('sha') == sha:
+            etag = old.get('etag')
+        _cache[key] = {'sha': sha, 'etag': etag, 'ts': time.time()}
+
+
+def revalidate_sha(owner, repo, ref):
+    """Revalidate a stale cache entry with a conditional request; returns its SHA or None."""
+    with _cache_lock:
+        entry = _cache.get(f'{owner}/{repo}@{ref}')
+    if entry and entry.get('sha'):
+        etag = entry.get('etag')
+        if etag:
+            body, code, headers = gh_api_get(f'https://api.github.com/repos/{owner}/{repo}/commits/{ref}', etag=etag)
+            if code == 304:
+                cache_store(owner, repo, ref, entry['sha'], etag)
+                return entry['sha']
+            if code == 200:
+                # the ref moved; this response already carries the new commit
+                try:
+                    sha = _json.loads(body).get('sha')
+                except (ValueError, AttributeError) as e:
+                    print(f'Warning: Failed to parse commit response: {e}', file=sys.stderr)
+                    sha = None
+                if sha:
+                    cache_store(owner, repo, ref, sha, headers.get('ETag'))
+                    return sha
+    return None
+
+
+def resolve_and_cache_sha(owner, repo, ref):
+    """Resolve a ref over REST and write the result through to the cache."""
+    sha, etag = resolve_sha(owner, repo, ref)
+    if sha:
+        cache_store(owner, repo, ref, sha, etag)
+    return sha
+
+
+def iter_uses(text):
+    """Yield (match, action, ref) for every ``uses:`` in text that can be pinned to a SHA."""
+    for m in USES_RE.finditer(text):
+        # `# ratchet:exclude` after the entry is an explicit opt-out from pinning
+        line_end = text.find('\n', m.end())
+        if 'ratchet:exclude' in text[m.end():line_end if line_end != -1 else len(text)]:
             continue
-        owner, repo = action.split('/', 1)
-        print(f'Resolving {action}@{ref} ... ', end='', flush=True)
-        sha = resolve_sha(owner, repo, ref)
+        yield m, m.group('action'), m.group('ref')
+
+
+def ref_key(action, ref):
+    """Return the (owner, repo, ref) triple used to resolve and memoize a ``uses:``.
+
+    GitHub owner and repo names are case-insensitive while refs are not, so
+    ``Actions/Checkout@v4`` and ``actions/checkout@v4`` share one lookup.
+    Actions in a subdirectory (``owner/repo/path@ref``) resolve against their
+    repository.
+    """
+    owner, repo = action.split('/')[:2]
+    return owner.lower(), repo.lower(), ref
+
+
+def collect_refs(text):
+    """Return the (owner, repo, ref) triple of every pinnable ``uses:`` in a workflow's text."""
+    return [ref_key(action, ref) for _, action, ref in iter_uses(text)]
+
+
+def resolve_all(triples):
+    """Resolve every triple and return a {triple: sha or None} map.
+
+    Fresh cache entries are used as-is and stale ones with an ETag are
+    revalidated concurrently (an unchanged ref costs a 304, which does not count
+    against the rate limit). The rest go out in one batched GraphQL query, and
+    whatever GraphQL cannot answer falls back to concurrent REST lookups.
+    """
+    ordered = sorted(triples)
+    shas = {t: cached_sha(*t) for t in ordered}
+    pending = [t for t in ordered if not shas[t]]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as ex:
+        shas.update(zip(pending, ex.map(lambda t: revalidate_sha(*t), pending)))
+        pending = [t for t in pending if not shas[t]]
+        if pending:
+            bulk = resolve_shas_bulk(pending)
+            for triple, sha in bulk.items():
+                cache_store(*triple, sha)
+            shas.update(bulk)
+        fallback = [t for t in pending if not shas[t]]
+        shas.update(zip(fallback, ex.map(lambda t: resolve_and_cache_sha(*t), fallback)))
+    for owner, repo, ref in ordered:
+        sha = shas[(owner, repo, ref)]
+        print(f'Resolving {owner}/{repo}@{ref} ... {sha or "FAILED"}')
+    return shas
+
+
+def process_file(path, text, shas):
+    out = []
+    prev = 0
+    for m, action, ref in iter_uses(text):
+        sha = shas.get(ref_key(action, ref))
         if not sha:
-            print('FAILED')
-            out.append(ln)
             continue
-        print(sha)
         # insert comment with original and replace the ref with the sha
-        out.append(f"{indent}# original uses: {action}@{ref}\n")
-        # replace only the first @ref occurrence on the line
-        replaced = re.sub(r'@(\S+)', f'@{sha}', ln, count=1)
-        out.append(replaced)
-        changed = True
+        out.append(text[prev:m.start()])
+        out.append(f"{m.group('indent')}# original uses: {action}@{ref}\n")
+        out.append(text[m.start():m.start('ref')])
+        out.append(sha)
+        prev = m.end('ref')
+    if not out:
+        return False
+    out.append(text[prev:])
 
-    if changed:
-        # backup original
-        with open(path + '.bak', 'w', encoding='utf-8') as b:
-            b.writelines(lines)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.writelines(out)
-    return changed
+    # write the new content beside the original and swap it in with a single
+    # rename, so an interrupted run never leaves a half-written workflow
+    p = Path(path)
+    # backup original
+    p.with_name(p.name + '.bak').write_text(text, encoding='utf-8')
+    tmp = p.with_name(p.name + '.tmp')
+    try:
+        tmp.write_text(''.join(out), encoding='utf-8')
+        os.replace(tmp, p)
+    except BaseException:
+        # don't leave a stray .tmp next to the workflow on failure or Ctrl-C
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return True
 
 
 def main():
     import glob
-    files = glob.glob(os.path.join(WORKFLOW_GLOB, '*.yml'))
+    files = sorted({p for pattern in WORKFLOW_GLOBS for p in glob.glob(pattern, recursive=True)})
     if not files:
         print('No workflow files')
         return
+    # file reads and rewrites are I/O-bound, so the executor's default
+    # thread count is a reasonable fit for both passes
+    with ThreadPoolExecutor() as ex:
+        texts = list(ex.map(lambda p: Path(p).read_text(encoding='utf-8'), files))
+    # collect every ref up front so duplicates across files resolve once and
+    # the network round-trips can overlap instead of running one by one; each
+    # file's text is kept and reused for the rewrite
+    uses = [triple for text in texts for triple in collect_refs(text)]
+    triples = set(uses)
+    print(f'Found {len(uses)} unpinned uses referencing {len(triples)} unique refs')
+    _cache.update(load_cache())
+    try:
+        shas = resolve_all(triples)
+    finally:
+        save_cache(_cache)
+    with ThreadPoolExecutor() as ex:
+        results = list(ex.map(lambda p, text: process_file(p, text, shas), files, texts))
     any_changed = False
-    for p in files:
-        print('Processing', p)
-        changed = process_file(p)
+    for p, changed in zip(files, results):
         if changed:
             any_changed = True
-            print('Modified', p)
+            print('Modified', p, f'(backup at {p}.bak)')
+    for owner, repo, ref in sorted(t for t, sha in shas.items() if not sha):
+        print(f'Could not resolve {owner}/{repo}@{ref}; left unpinned')
     if not any_changed:
         print('No changes')
+        return
+    print('Review changes with: git diff')
+    print("If OK: git add <files> && git commit -m 'Pin GitHub Actions to full SHAs'")
 
 
 if __name__ == '__main__':